@@ -21,8 +21,9 @@ ENV_FILE_PATH = BASE_DIR / ".env"
 class AppSettings(BaseSettings):
     """Модель настроек приложения с использованием Pydantic."""
 
+    # Экземпляр кешируется get_config и разделяется всеми модулями, поэтому он неизменяемый
     model_config = SettingsConfigDict(
-        env_file_encoding="utf-8", extra="ignore"
+        env_file_encoding="utf-8", extra="ignore", frozen=True
     )
 
     # Настройки логгирования
@@ -4,6 +4,7 @@ import os
 import asyncio
 from asyncio import Queue, CancelledError
 import json
+from tempfile import TemporaryDirectory
 
 from PySide6.QtCore import QObject, Signal, QRunnable, QThreadPool, Slot
 from PySide6.QtGui import QCloseEvent
@@ -149,8 +150,6 @@ class DownloadUploadWorker(QRunnable):
 
     async def main_pipeline(self):
         """Организует асинхронный конвейер: скачивание -> очередь -> загрузка."""
-        from tempfile import TemporaryDirectory
-
         is_local_save = self.cloud == LOCAL_SAVE_OPTION
         temp_dir_manager = None if is_local_save else TemporaryDirectory(prefix="vdu_")
         target_dir = Path(self.folder) if is_local_save else Path(temp_dir_manager.name)
@@ -3,6 +3,7 @@ import sys
 import asyncio
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from typing import Any, Callable, Coroutine
 
 from src.config import get_config, ConfigError
 from src.logger import setup_logger
@@ -10,17 +11,25 @@ from src.downloader import download_video
 from src.gui import main as show_gui
 from src.uploader import upload_single_file, UPLOADER_STRATEGIES
 
+# Сообщение об ошибке при запуске CLI без обязательного аргумента --url
+ERROR_MISSING_URL = "Ошибка: аргумент --url обязателен для режима CLI."
+
+
 class CliOperationError(Exception):
     """Кастомное исключение для ошибок в CLI-режиме."""
     pass
 
-def main():
+def main(run: Callable[[Coroutine], Any] = asyncio.run):
     """
     Основная точка входа в приложение.
 
     Анализирует аргументы командной строки. Если аргументы отсутствуют,
     запускает графический интерфейс (GUI). В противном случае, выполняет
     операцию скачивания и/или загрузки в режиме командной строки (CLI).
+
+    Args:
+        run (Callable[[Coroutine], Any]): Функция, выполняющая корутину загрузки
+            и возвращающая ее результат. По умолчанию asyncio.run.
     """
     parser = argparse.ArgumentParser(description="Скачивание и загрузка видео.")
     parser.add_argument("--url", help="URL видео для скачивания.")
@@ -37,7 +46,7 @@ def main():
 
     # Если переданы другие аргументы, но не URL - это ошибка
     if not args.url:
-        print("Ошибка: аргумент --url обязателен для режима CLI.", file=sys.stderr)
+        print(ERROR_MISSING_URL, file=sys.stderr)
         sys.exit(1)
 
     # Если аргументы переданы, выполняем логику CLI
@@ -75,7 +84,7 @@ def main():
                     "filename": filename,
                 }
                 # Запускаем асинхронную функцию
-                upload_result = asyncio.run(upload_single_file(task))
+                upload_result = run(upload_single_file(task))
                 if upload_result["status"] != "успех":
                     raise CliOperationError(f"Загрузка не удалась: {upload_result.get('error', 'Неизвестная ошибка')}")
                 logger.info(f"Файл успешно загружен. URL/Path: {upload_result.get('url') or upload_result.get('path')}")
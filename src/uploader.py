@@ -106,11 +106,11 @@ class YandexDiskUploaderStrategy(UploaderStrategy):
 class GoogleDriveUploaderStrategy(UploaderStrategy):
     """Стратегия для загрузки файлов на Google Drive."""
 
-    def _find_or_create_folder(self, service, parent_id: str, folder_name: str) -> str:
+    def _find_or_create_folder(self, files, parent_id: str, folder_name: str) -> str:
         """Находит папку по имени или создает ее, если она не существует."""
         query = f"'{parent_id}' in parents and name='{folder_name}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
         try:
-            response = service.files().list(q=query, fields="files(id, name)").execute()
+            response = files.list(q=query, fields="files(id, name)").execute()
             if response.get("files"):
                 return response["files"][0]["id"]
         except HttpError as e:
@@ -118,17 +118,17 @@ class GoogleDriveUploaderStrategy(UploaderStrategy):
 
         file_metadata = {"name": folder_name, "mimeType": "application/vnd.google-apps.folder", "parents": [parent_id]}
         try:
-            folder = service.files().create(body=file_metadata, fields="id").execute()
+            folder = files.create(body=file_metadata, fields="id").execute()
             return folder.get("id")
         except HttpError as e:
             raise UploadError(f"Ошибка API Google Drive при создании папки '{folder_name}'", details=e) from e
 
-    def _create_folders_chain(self, service, root_id: str, path: str) -> str:
+    def _create_folders_chain(self, files, root_id: str, path: str) -> str:
         """Создает всю цепочку вложенных папок и возвращает ID последней."""
         parent_id = root_id
         for folder_name in path.strip("/").split("/"):
             if folder_name:
-                parent_id = self._find_or_create_folder(service, parent_id, folder_name)
+                parent_id = self._find_or_create_folder(files, parent_id, folder_name)
         return parent_id
 
     def _upload_sync(self, file_path: Path, cloud_folder_path: str, filename: str) -> Dict[str, Any]:
@@ -139,10 +139,13 @@ class GoogleDriveUploaderStrategy(UploaderStrategy):
 
         try:
             service = build("drive", "v3", credentials=creds)
-            folder_id = self._create_folders_chain(service, "root", cloud_folder_path)
+            # Ресурс files() собирается клиентом заново при каждом обращении, поэтому создается один раз
+            files = service.files()
+            folder_id = self._create_folders_chain(files, "root", cloud_folder_path)
             file_metadata = {"name": filename, "parents": [folder_id]}
             media = MediaFileUpload(str(file_path), resumable=True)
-            file = service.files().create(body=file_metadata, media_body=media, fields="id, webViewLink").execute()
+            # Временные ошибки (5xx, 429) клиент повторяет сам с экспоненциальной задержкой
+            file = files.create(body=file_metadata, media_body=media, fields="id, webViewLink").execute(num_retries=5)
             return {"status": STATUS_SUCCESS, "id": file.get("id"), "url": file.get("webViewLink")}
         except HttpError as e:
             raise UploadError(f"Ошибка API Google Drive: {e}", details=e) from e
@@ -0,0 +1,126 @@
+import asyncio
+import cProfile
+import hashlib
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest.mock import MagicMock, create_autospec, patch
+
+import pytest
+
+from src.config import AppSettings, get_config
+from src.downloader import download_video
+from src.logger import setup_logger
+from src.uploader import upload_single_file
+
+# Папка (относительно корня проекта) для файлов профилирования при запуске с --profile
+PROFILE_DIR_NAME = ".prof"
+
+
+def pytest_addoption(parser):
+    """Регистрирует флаг --profile."""
+    parser.addoption(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Профилировать каждый тест через cProfile и сохранять результаты в .prof/",
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Оборачивает вызов теста в cProfile, если передан флаг --profile."""
+    if not item.config.getoption("--profile"):
+        return (yield)
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return (yield)
+    finally:
+        profiler.disable()
+        profile_dir = item.config.rootpath / PROFILE_DIR_NAME
+        profile_dir.mkdir(exist_ok=True)
+        # Параметры в nodeid бывают длинными, поэтому вместо них - короткий хеш
+        nodeid_hash = hashlib.sha1(item.nodeid.encode()).hexdigest()[:8]
+        profiler.dump_stats(profile_dir / f"{item.path.stem}.{item.originalname}.{nodeid_hash}.prof")
+
+
+@pytest.fixture(scope="session")
+def _main_mock_templates():
+    """
+    Эталонные autospec-моки зависимостей src.main.
+
+    create_autospec обходит сигнатуры целевых объектов, поэтому моки строятся
+    один раз за сессию, а между тестами только сбрасываются. Для get_config
+    спецификация строится по исходной функции, а не по lru_cache-обертке.
+    """
+    return SimpleNamespace(
+        get_config=create_autospec(get_config.__wrapped__),
+        setup_logger=create_autospec(setup_logger),
+        download_video=create_autospec(download_video),
+        upload_single_file=create_autospec(upload_single_file),
+    )
+
+
+@pytest.fixture(scope="session")
+def _cli_config_template():
+    """Эталонный autospec-мок AppSettings для CLI-тестов."""
+    return create_autospec(AppSettings, instance=True)
+
+
+@pytest.fixture
+def cli_config(_cli_config_template):
+    """Сброшенный мок конфигурации с предустановленными настройками логгирования."""
+    _cli_config_template.reset_mock()
+    _cli_config_template.LOG_LEVEL = "INFO"
+    _cli_config_template.LOG_TO_FILE = False
+    _cli_config_template.LOG_FILE_PATH = "/tmp/test.log"
+    return _cli_config_template
+
+
+@pytest.fixture
+def main_mocks(_main_mock_templates, cli_config):
+    """Подменяет зависимости src.main сброшенными эталонными моками."""
+    for func_mock in vars(_main_mock_templates).values():
+        # return_value и side_effect autospec-функции хранятся на самой функции,
+        # поэтому reset_mock их не сбрасывает - задаем заново
+        func_mock.reset_mock()
+        func_mock.side_effect = None
+        func_mock.return_value = MagicMock()
+    _main_mock_templates.get_config.return_value = cli_config
+    with patch.multiple("src.main", **vars(_main_mock_templates)):
+        yield _main_mock_templates
+
+
+@pytest.fixture(scope="session")
+def shared_tmp(tmp_path_factory):
+    """Временная папка, создаваемая один раз на всю сессию."""
+    return tmp_path_factory.mktemp("vdu")
+
+
+@pytest.fixture
+def patched_tempdir(shared_tmp, monkeypatch):
+    """
+    Подменяет TemporaryDirectory сессионной папкой.
+
+    GUI-конвейер использует атрибут name и метод cleanup(), CLI - контекстный
+    менеджер, поэтому подменяются оба места.
+    """
+    fake_temp_dir = SimpleNamespace(name=str(shared_tmp), cleanup=lambda: None)
+    monkeypatch.setattr("src.gui.TemporaryDirectory", lambda *args, **kwargs: fake_temp_dir)
+    monkeypatch.setattr("src.main.TemporaryDirectory", lambda *args, **kwargs: nullcontext(str(shared_tmp)))
+    return shared_tmp
+
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """
+    Политика цикла событий для асинхронных тестов.
+
+    Используется uvloop, если он установлен (на Windows он недоступен),
+    иначе - стандартная политика asyncio.
+    """
+    try:
+        import uvloop
+    except ImportError:
+        return asyncio.DefaultEventLoopPolicy()
+    return uvloop.EventLoopPolicy()
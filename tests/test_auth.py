@@ -1,10 +1,15 @@
+import os
 import pytest
+from types import SimpleNamespace
 from unittest.mock import patch, MagicMock
 from pydantic import SecretStr
 from src import auth
 from src.auth import get_yandex_token, get_google_drive_credentials, AuthError, _load_creds_from_token_file, _refresh_creds, _run_oauth_flow
 from src.config import AppSettings
 
+# Настройки по умолчанию строятся один раз: тесты их не изменяют
+_DEFAULT_SETTINGS = AppSettings.model_construct(GOOGLE_CREDS_PATH='dummy_creds.json')
+
 
 @pytest.fixture(autouse=True)
 def clear_caches():
@@ -18,13 +23,37 @@ def clear_caches():
 def mock_config(monkeypatch):
     """Фабрика для создания и внедрения мока AppSettings."""
     def _factory(**kwargs):
-        if 'GOOGLE_CREDS_PATH' not in kwargs:
-            kwargs['GOOGLE_CREDS_PATH'] = 'dummy_creds.json'
-        settings = AppSettings.model_construct(**kwargs)
+        if not kwargs:
+            settings = _DEFAULT_SETTINGS
+        else:
+            if 'GOOGLE_CREDS_PATH' not in kwargs:
+                kwargs['GOOGLE_CREDS_PATH'] = 'dummy_creds.json'
+            settings = AppSettings.model_construct(**kwargs)
         monkeypatch.setattr(auth, "get_config", lambda: settings)
         return settings
     return _factory
 
+
+@pytest.fixture
+def google_flow_mocks(monkeypatch):
+    """
+    Подменяет шаги получения учетных данных Google одним набором моков.
+
+    По умолчанию файл credentials.json существует, token.json отсутствует,
+    обновление токена не удается, а OAuth возвращает валидные учетные данные.
+    """
+    mocks = SimpleNamespace(
+        path_exists=MagicMock(return_value=True),
+        load_creds=MagicMock(return_value=None),
+        refresh_creds=MagicMock(return_value=None),
+        run_oauth_flow=MagicMock(return_value=MagicMock(valid=True)),
+    )
+    monkeypatch.setattr("src.auth.os.path.exists", mocks.path_exists)
+    monkeypatch.setattr(auth, "_load_creds_from_token_file", mocks.load_creds)
+    monkeypatch.setattr(auth, "_refresh_creds", mocks.refresh_creds)
+    monkeypatch.setattr(auth, "_run_oauth_flow", mocks.run_oauth_flow)
+    return mocks
+
 # ==================================
 # Тесты для get_yandex_token
 # ==================================
@@ -63,34 +92,28 @@ def test_get_google_creds_cache_hit(mock_config):
         mock_load.assert_not_called()
 
 
-@patch("src.auth._run_oauth_flow", return_value=MagicMock(valid=True))
-@patch("src.auth._refresh_creds", return_value=None)
-@patch("src.auth._load_creds_from_token_file")
-@patch("src.auth.os.path.exists", return_value=True)
-def test_get_google_creds_full_flow(mock_path_exists, mock_load, mock_refresh, mock_run_flow, mock_config):
+def test_get_google_creds_full_flow(google_flow_mocks, mock_config):
     """Тест полного цикла: загрузка не удалась, обновление не удалось, запускается OAuth."""
     mock_config()
-    mock_load.return_value = MagicMock(valid=False, expired=True, refresh_token="token")
+    google_flow_mocks.load_creds.return_value = MagicMock(valid=False, expired=True, refresh_token="token")
     get_google_drive_credentials()
-    mock_load.assert_called_once()
-    mock_refresh.assert_called_once()
-    mock_run_flow.assert_called_once()
+    google_flow_mocks.load_creds.assert_called_once()
+    google_flow_mocks.refresh_creds.assert_called_once()
+    google_flow_mocks.run_oauth_flow.assert_called_once()
 
 
-@patch("src.auth._run_oauth_flow", return_value=None)
-@patch("src.auth._load_creds_from_token_file", return_value=None)
-@patch("src.auth.os.path.exists", return_value=True)
-def test_get_google_creds_oauth_flow_fails_raises_error(mock_path_exists, mock_load, mock_run_flow, mock_config):
+def test_get_google_creds_oauth_flow_fails_raises_error(google_flow_mocks, mock_config):
     """Тест: если полный цикл OAuth не возвращает учетные данные, выбрасывается ошибка."""
     mock_config()
+    google_flow_mocks.run_oauth_flow.return_value = None
     with pytest.raises(AuthError, match="Не удалось получить учетные данные Google Drive"):
         get_google_drive_credentials()
 
 
-@patch("src.auth.os.path.exists", return_value=False)
-def test_get_google_creds_no_creds_file_raises_error(mock_path_exists, mock_config):
+def test_get_google_creds_no_creds_file_raises_error(google_flow_mocks, mock_config):
     """Тест: если файл credentials.json не найден, выбрасывается ошибка."""
     mock_config(GOOGLE_CREDS_PATH="non-existent.json")
+    google_flow_mocks.path_exists.return_value = False
     with pytest.raises(AuthError, match="Файл учетных данных Google 'credentials.json' не найден"):
         get_google_drive_credentials()
 
@@ -98,28 +121,34 @@ def test_get_google_creds_no_creds_file_raises_error(mock_path_exists, mock_conf
 # Тесты для вспомогательных функций
 # ==================================
 
+@pytest.fixture
+def token_path(tmp_path):
+    """Путь к реальному файлу token.json во временной папке."""
+    path = tmp_path / "token.json"
+    path.write_text("{}")
+    return str(path)
+
+
 @patch("src.auth.Credentials")
-@patch("src.auth.os.path.exists", return_value=True)
-def test_load_creds_from_token_file_success(mock_path_exists, mock_credentials):
+def test_load_creds_from_token_file_success(mock_credentials, token_path):
     """Тест успешной загрузки из token.json."""
     mock_creds_instance = MagicMock()
     mock_credentials.from_authorized_user_file.return_value = mock_creds_instance
-    creds = _load_creds_from_token_file("token.json")
+    creds = _load_creds_from_token_file(token_path)
     assert creds is mock_creds_instance
-    mock_credentials.from_authorized_user_file.assert_called_once_with("token.json", scopes=["https://www.googleapis.com/auth/drive"])
+    mock_credentials.from_authorized_user_file.assert_called_once_with(token_path, scopes=["https://www.googleapis.com/auth/drive"])
 
 
-@patch("src.auth.os.path.exists", return_value=False)
-def test_load_creds_from_token_file_not_exists(mock_path_exists):
+def test_load_creds_from_token_file_not_exists(tmp_path):
     """Тест: если token.json не существует, возвращается None."""
-    assert _load_creds_from_token_file("token.json") is None
+    assert _load_creds_from_token_file(str(tmp_path / "token.json")) is None
 
 
-@patch("src.auth.Credentials.from_authorized_user_file", side_effect=Exception("Corrupted"))
-@patch("src.auth.os.path.exists", return_value=True)
-def test_load_creds_from_token_file_corrupted(mock_path_exists, mock_from_file):
+def test_load_creds_from_token_file_corrupted(tmp_path):
     """Тест: если token.json поврежден, возвращается None."""
-    assert _load_creds_from_token_file("token.json") is None
+    corrupted_path = tmp_path / "token.json"
+    corrupted_path.write_text("not a json")
+    assert _load_creds_from_token_file(str(corrupted_path)) is None
 
 
 def test_refresh_creds_success():
@@ -130,30 +159,28 @@ def test_refresh_creds_success():
     mock_creds.refresh.assert_called_once()
 
 
-@patch("src.auth.os.remove")
-@patch("src.auth.os.path.exists", return_value=True)
-def test_refresh_creds_failure(mock_path_exists, mock_os_remove):
+def test_refresh_creds_failure(token_path):
     """Тест: если обновление не удалось, старый токен удаляется и возвращается None."""
     mock_creds = MagicMock()
     mock_creds.refresh.side_effect = Exception("Refresh failed")
-    refreshed = _refresh_creds(mock_creds, "token.json")
+    refreshed = _refresh_creds(mock_creds, token_path)
     assert refreshed is None
-    mock_os_remove.assert_called_once_with("token.json")
+    assert not os.path.exists(token_path)
 
 
-@patch("builtins.open")
 @patch("src.auth.InstalledAppFlow")
-def test_run_oauth_flow_success(mock_flow, mock_open):
+def test_run_oauth_flow_success(mock_flow, tmp_path):
     """Тест успешного прохождения OAuth 2.0."""
     mock_flow_instance = mock_flow.from_client_secrets_file.return_value
     mock_creds = MagicMock()
-    mock_creds.to_json.return_value = "{}"
+    mock_creds.to_json.return_value = '{"token": "new"}'
     mock_flow_instance.run_local_server.return_value = mock_creds
-    creds = _run_oauth_flow("creds.json", "token.json")
+    token_file = tmp_path / "token.json"
+    creds = _run_oauth_flow("creds.json", str(token_file))
     assert creds is mock_creds
     mock_flow.from_client_secrets_file.assert_called_once_with("creds.json", scopes=["https://www.googleapis.com/auth/drive"])
     mock_flow_instance.run_local_server.assert_called_once_with(port=0)
-    mock_open.assert_called_once_with("token.json", "w")
+    assert token_file.read_text() == '{"token": "new"}'
 
 
 @patch("src.auth.InstalledAppFlow.from_client_secrets_file", side_effect=Exception("Flow error"))
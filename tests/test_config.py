@@ -1,7 +1,7 @@
 import os
 import pytest
 from unittest.mock import patch
-from pydantic import SecretStr
+from pydantic import SecretStr, ValidationError
 from dotenv import dotenv_values
 from src import config
 from src.config import AppSettings, get_config, reload_config, save_specific_settings_to_env, ConfigError
@@ -56,6 +56,14 @@ def test_app_settings_env_variable_overrides_file(mock_env_file, monkeypatch):
     assert settings.LOG_LEVEL == "WARNING"
 
 
+def test_app_settings_is_frozen(mock_env_file):
+    """Тест, что кешированные настройки нельзя изменить после загрузки."""
+    settings = get_config()
+
+    with pytest.raises(ValidationError):
+        settings.LOG_LEVEL = "DEBUG"
+
+
 def test_get_config_is_cached(mock_env_file):
     """Тест, что get_config() кеширует результат и возвращает один и тот же объект."""
     config1 = get_config()
@@ -1,6 +1,6 @@
 import json
 import pytest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, DEFAULT, MagicMock
 
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QApplication, QPushButton, QLineEdit, QDialog
@@ -9,6 +9,8 @@ from PySide6.QtGui import QCloseEvent
 from src.config import AppSettings
 from src.gui import VideoUploaderGUI
 
+pytestmark = pytest.mark.slow
+
 
 @pytest.fixture(scope="session")
 def qapp():
@@ -19,15 +21,20 @@ def qapp():
     return app
 
 
+@pytest.fixture(scope="module")
+def gui_config():
+    """Настройки по умолчанию: валидация AppSettings выполняется один раз на модуль."""
+    return AppSettings()
+
+
 @pytest.fixture
-def main_window(qapp, qtbot, monkeypatch):
+def main_window(qapp, qtbot, monkeypatch, gui_config):
     """
     Фикстура для создания и настройки главного окна GUI для тестирования.
     - Мокирует конфигурацию, логгер и загрузку сессии.
     - Возвращает экземпляр VideoUploaderGUI.
     """
-    config_instance = AppSettings()
-    monkeypatch.setattr("src.gui.get_config", lambda: config_instance)
+    monkeypatch.setattr("src.gui.get_config", lambda: gui_config)
 
     mock_logger = MagicMock()
     monkeypatch.setattr("src.gui.setup_logger", lambda *args, **kwargs: mock_logger)
@@ -230,12 +237,28 @@ def test_cancel_processing(main_window):
     assert "Отмена операции..." in main_window.status_label.text()
 
 
-@patch("src.gui.save_specific_settings_to_env")
-@patch("src.gui.reload_config")
-@patch("src.gui.setup_logger")
-@patch("src.gui.SettingsDialog")
-def test_open_settings_accepted(mock_dialog_class, mock_setup_logger, mock_reload_config, mock_save_settings, main_window):
+@pytest.fixture
+def settings_flow_mocks(main_window):
+    """
+    Подменяет зависимости open_settings одним patch.multiple.
+
+    QMessageBox тоже подменяется: иначе итоговое сообщение открывает
+    настоящее модальное окно и тест зависает.
+    """
+    with patch.multiple(
+        "src.gui",
+        SettingsDialog=DEFAULT,
+        save_specific_settings_to_env=DEFAULT,
+        reload_config=DEFAULT,
+        setup_logger=DEFAULT,
+        QMessageBox=DEFAULT,
+    ) as mocks:
+        yield mocks
+
+
+def test_open_settings_accepted(main_window, settings_flow_mocks):
     """Тест: открытие и принятие диалога настроек вызывает сохранение и перезагрузку."""
+    mock_dialog_class = settings_flow_mocks["SettingsDialog"]
     mock_dialog_instance = mock_dialog_class.return_value
     mock_dialog_instance.exec.return_value = QDialog.Accepted
     mock_dialog_instance.get_settings_data.return_value = {"LOG_LEVEL": "DEBUG"}
@@ -243,24 +266,21 @@ def test_open_settings_accepted(mock_dialog_class, mock_setup_logger, mock_reloa
     main_window.open_settings()
 
     mock_dialog_class.assert_called_once_with(main_window)
-    mock_save_settings.assert_called_once_with({"LOG_LEVEL": "DEBUG"})
-    mock_reload_config.assert_called_once()
-    mock_setup_logger.assert_called_once()
+    settings_flow_mocks["save_specific_settings_to_env"].assert_called_once_with({"LOG_LEVEL": "DEBUG"})
+    settings_flow_mocks["reload_config"].assert_called_once()
+    settings_flow_mocks["setup_logger"].assert_called_once()
 
 
-@patch("src.gui.save_specific_settings_to_env")
-@patch("src.gui.reload_config")
-@patch("src.gui.SettingsDialog")
-def test_open_settings_rejected(mock_dialog_class, mock_reload_config, mock_save_settings, main_window):
+def test_open_settings_rejected(main_window, settings_flow_mocks):
     """Тест: отклонение диалога настроек не вызывает никаких действий."""
-    mock_dialog_instance = mock_dialog_class.return_value
-    mock_dialog_instance.exec.return_value = QDialog.Rejected
+    mock_dialog_class = settings_flow_mocks["SettingsDialog"]
+    mock_dialog_class.return_value.exec.return_value = QDialog.Rejected
 
     main_window.open_settings()
 
     mock_dialog_class.assert_called_once_with(main_window)
-    mock_save_settings.assert_not_called()
-    mock_reload_config.assert_not_called()
+    settings_flow_mocks["save_specific_settings_to_env"].assert_not_called()
+    settings_flow_mocks["reload_config"].assert_not_called()
 
 
 def test_save_session_state(main_window, monkeypatch, tmp_path):
@@ -58,7 +58,6 @@ def test_setup_logger_creates_log_directory(tmp_path):
 def test_setup_logger_handles_io_error_on_file_creation(mock_handler, capsys):
     """Тест: обработка ошибки IOError при создании файлового обработчика."""
     mock_handler.side_effect = IOError("Permission denied")
-    from pathlib import Path
     log_path = Path("/protected/path.log")
 
     # Используем patch на print, чтобы проверить вывод в консоль
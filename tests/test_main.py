@@ -1,110 +1,101 @@
+import sys
+from pathlib import Path
+
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from unittest.mock import patch
 
-from src.main import main
+from src.main import main, ERROR_MISSING_URL
 from src.config import ConfigError
 
+# Наборы аргументов командной строки для CLI-тестов
+ARGV_GUI = ('vdu-cli',)
+ARGV_HELP = ('vdu-cli', '--help')
+ARGV_NO_URL = ('vdu-cli', '--cloud', 'Google Drive')
+ARGV_DOWNLOAD_ONLY = ('vdu-cli', '--url', 'test_url')
+ARGV_GDRIVE = ARGV_DOWNLOAD_ONLY + ('--cloud', 'Google Drive', '--path', 'cloud_folder')
+ARGV_YANDEX = ARGV_DOWNLOAD_ONLY + ('--cloud', 'Yandex.Disk', '--path', 'cloud_folder')
+
 
-@pytest.fixture
-def mock_cli_config(monkeypatch):
-    """Фикстура для мокирования get_config для CLI-тестов."""
-    mock_config_instance = MagicMock()
-    mock_config_instance.LOG_LEVEL = "INFO"
-    mock_config_instance.LOG_TO_FILE = False
-    mock_config_instance.LOG_FILE_PATH = "/tmp/test.log"
-    monkeypatch.setattr("src.main.get_config", lambda: mock_config_instance)
-    return mock_config_instance
+def _runner(result):
+    """Возвращает runner, который закрывает корутину загрузки без event loop и отдает result."""
+    def run(coro):
+        coro.close()
+        return result
+    return run
 
 
-@patch('src.main.sys.argv', ['vdu-cli'])
 @patch('src.main.show_gui')
-def test_main_no_args_calls_gui(mock_show_gui):
+def test_main_no_args_calls_gui(mock_show_gui, monkeypatch):
     """Тест: вызов без аргументов запускает GUI."""
+    monkeypatch.setattr(sys, "argv", list(ARGV_GUI))
     with pytest.raises(SystemExit):
         main()
     mock_show_gui.assert_called_once()
 
 
-@patch('src.main.sys.argv', ['vdu-cli', '--help'])
-def test_main_with_help_arg_exits():
+def test_main_with_help_arg_exits(monkeypatch):
     """Тест: вызов с --help должен завершать программу."""
+    monkeypatch.setattr(sys, "argv", list(ARGV_HELP))
     with pytest.raises(SystemExit) as e:
         main()
     assert e.value.code == 0
 
 
-@patch('src.main.sys.argv', ['vdu-cli', '--url', 'test_url'])
-@patch('src.main.download_video')
-@patch('src.main.upload_single_file')
-def test_main_cli_no_cloud_only_downloads(mock_upload, mock_download, mock_cli_config, tmp_path):
-    """Тест: CLI без --cloud только скачивает файл."""
-    mock_download.return_value = {"status": "успех", "path": tmp_path / "video.mp4"}
-    main()
-    mock_download.assert_called_once()
-    mock_upload.assert_not_called()
-
-
-@patch('src.main.sys.argv', ['vdu-cli', '--url', 'test_url', '--cloud', 'Google Drive', '--path', 'gdrive_folder'])
-@patch('src.main.download_video')
-@patch('src.main.upload_single_file', new_callable=AsyncMock)
-@patch('asyncio.run')
-def test_main_cli_with_cloud_calls_uploader(mock_asyncio_run, mock_upload, mock_download, mock_cli_config, tmp_path):
-    """Тест: CLI с --cloud вызывает единый загрузчик."""
-    video_file = tmp_path / "video.mp4"
-    video_file.touch()
-    mock_download.return_value = {"status": "успех", "path": video_file}
-    mock_asyncio_run.return_value = {"status": "успех"}
-
-    main()
-
-    mock_download.assert_called_once()
-    mock_upload.assert_called_once_with({
+@pytest.mark.parametrize("argv, cloud", [
+    (ARGV_DOWNLOAD_ONLY, None),
+    (ARGV_GDRIVE, "Google Drive"),
+    (ARGV_YANDEX, "Yandex.Disk"),
+])
+def test_main_cli_dispatch(argv, cloud, main_mocks, monkeypatch, patched_tempdir):
+    """Тест: CLI скачивает файл и вызывает единый загрузчик только при указанном --cloud."""
+    monkeypatch.setattr(sys, "argv", list(argv))
+    # CLI работает только с путем к файлу, поэтому создавать сам файл не нужно
+    video_file = patched_tempdir / "video.mp4"
+    main_mocks.download_video.return_value = {"status": "успех", "path": video_file}
+
+    main(run=_runner({"status": "успех"}))
+
+    main_mocks.download_video.assert_called_once()
+    if not cloud:
+        main_mocks.upload_single_file.assert_not_called()
+        return
+    main_mocks.upload_single_file.assert_called_once_with({
         "file_path": str(video_file),
-        "cloud_storage": "Google Drive",
-        "cloud_folder_path": "gdrive_folder",
+        "cloud_storage": cloud,
+        "cloud_folder_path": "cloud_folder",
         "filename": "video.mp4",
     })
-    mock_asyncio_run.assert_called_once()
-
-
-@patch('src.main.sys.argv', ['vdu-cli', '--cloud', 'Google Drive'])
-def test_main_cli_missing_url_exits():
-    """Тест: CLI без --url должен завершаться с ошибкой."""
-    with pytest.raises(SystemExit) as e:
-        main()
-    assert e.value.code == 1
 
 
-@patch('src.main.sys.argv', ['vdu-cli', '--url', 'test_url'])
-@patch('src.main.download_video')
-def test_main_cli_handles_download_exception(mock_download, mock_cli_config):
-    """Тест: CLI корректно обрабатывает исключение при скачивании."""
-    mock_download.return_value = {"status": "ошибка", "error": "Download failed"}
+@pytest.mark.parametrize("argv, config_error, download_result, upload_result, expected_stderr", [
+    pytest.param(ARGV_NO_URL, None, None, None, ERROR_MISSING_URL, id="missing_url"),
+    pytest.param(
+        ARGV_DOWNLOAD_ONLY, ConfigError("Test config error"), None, None, "Test config error",
+        id="config_error",
+    ),
+    pytest.param(
+        ARGV_DOWNLOAD_ONLY, None, {"status": "ошибка", "error": "Download failed"}, None, None,
+        id="download_failed",
+    ),
+    pytest.param(
+        ARGV_GDRIVE, None,
+        {"status": "успех", "path": Path("video.mp4")}, {"status": "ошибка", "error": "Upload failed"}, None,
+        id="upload_failed",
+    ),
+])
+def test_main_cli_error_exits(
+    argv, config_error, download_result, upload_result, expected_stderr, main_mocks, monkeypatch,
+    patched_tempdir, capsys
+):
+    """Тест: ошибки аргументов, конфигурации, скачивания и загрузки завершают CLI с кодом 1."""
+    monkeypatch.setattr(sys, "argv", list(argv))
+    main_mocks.get_config.side_effect = config_error
+    main_mocks.download_video.return_value = download_result
     with pytest.raises(SystemExit) as e:
-        main()
+        main(run=_runner(upload_result))
     assert e.value.code == 1
-
-
-@patch('src.main.sys.argv', ['vdu-cli', '--url', 'test_url', '--cloud', 'Google Drive'])
-@patch('src.main.download_video')
-@patch('asyncio.run')
-def test_main_cli_handles_upload_exception(mock_asyncio_run, mock_download, mock_cli_config, tmp_path):
-    """Тест: CLI корректно обрабатывает исключение при загрузке."""
-    video_file = tmp_path / "video.mp4"
-    video_file.touch()
-    mock_download.return_value = {"status": "успех", "path": video_file}
-    mock_asyncio_run.return_value = {"status": "ошибка", "error": "Upload failed"}
-
-    with pytest.raises(SystemExit) as e:
-        main()
-    assert e.value.code == 1
-
-
-@patch('src.main.sys.argv', ['vdu-cli', '--url', 'test_url'])
-@patch('src.main.get_config')
-def test_main_cli_handles_config_error(mock_get_config):
-    """Тест: CLI корректно обрабатывает ошибку конфигурации."""
-    mock_get_config.side_effect = ConfigError("Test config error")
-    with pytest.raises(SystemExit) as e:
-        main()
-    assert e.value.code == 1
\ No newline at end of file
+    if expected_stderr:
+        # Ошибки до настройки логгера выводятся в stderr
+        assert expected_stderr in capsys.readouterr().err
+    else:
+        main_mocks.setup_logger.return_value.critical.assert_called_once()
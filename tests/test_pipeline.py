@@ -1,21 +1,40 @@
 import asyncio
+import threading
 from asyncio import CancelledError
 from pathlib import Path
+from types import MappingProxyType
 from unittest.mock import patch, MagicMock, AsyncMock
 
 import pytest
 from src.gui import DownloadUploadWorker, CancellationFlag, WorkerSignals
 
+# Неизменяемая часть параметров воркера, общая для всех тестов
+_BASE_WORKER_PARAMS = MappingProxyType({
+    "urls": ("http://test.url/1",),
+    "cloud": "Google Drive",
+    "folder": "test_folder",
+    "filename_template": "",
+    "quality_format": "best",
+    "proxy": None,
+})
 
-@pytest.fixture
-def cancellation_flag():
-    """Фикстура для флага отмены."""
+
+@pytest.fixture(scope="session")
+def _shared_cancellation_flag():
+    """Единственный экземпляр флага отмены на всю сессию."""
     return CancellationFlag()
 
 
 @pytest.fixture
-def worker_signals():
-    """Фикстура для сигналов воркера."""
+def cancellation_flag(_shared_cancellation_flag):
+    """Фикстура для флага отмены: общий экземпляр, сброшенный перед тестом."""
+    _shared_cancellation_flag.reset()
+    return _shared_cancellation_flag
+
+
+@pytest.fixture(scope="session")
+def _worker_signals_template():
+    """Эталонный мок сигналов воркера, создается один раз за сессию."""
     # В реальном GUI это объекты PySide, здесь нам достаточно моков
     signals = MagicMock(spec=WorkerSignals)
     signals.finished = MagicMock()
@@ -25,90 +44,87 @@ def worker_signals():
 
 
 @pytest.fixture
-def base_worker_params(cancellation_flag):
-    """Базовые параметры для инициализации воркера."""
-    return {
-        "urls": ["http://test.url/1"],
-        "cloud": "Google Drive",
-        "folder": "test_folder",
-        "filename_template": "",
-        "quality_format": "best",
-        "cancellation_flag": cancellation_flag,
-        "proxy": None,
-    }
-
-
-# ============================================
-# Тесты для логики runner'а (метода run)
-# ============================================
+def worker_signals(_worker_signals_template):
+    """Фикстура для сигналов воркера: сброшенный эталонный мок."""
+    _worker_signals_template.reset_mock(return_value=True, side_effect=True)
+    return _worker_signals_template
 
-@patch("src.gui.DownloadUploadWorker.main_pipeline", new_callable=AsyncMock)
-def test_run_method_calls_main_pipeline(mock_main_pipeline, base_worker_params, worker_signals):
-    """Тест: метод run() успешно вызывает main_pipeline."""
-    worker = DownloadUploadWorker(**base_worker_params)
-    worker.signals = worker_signals
-
-    worker.run()
-    mock_main_pipeline.assert_awaited_once()
-    worker.signals.error.emit.assert_not_called()
-    worker.signals.finished.emit.assert_not_called()
 
+@pytest.fixture
+def base_worker_params(cancellation_flag):
+    """Базовые параметры для инициализации воркера со сброшенным флагом отмены."""
+    return MappingProxyType({**_BASE_WORKER_PARAMS, "cancellation_flag": cancellation_flag})
 
-@patch("src.gui.DownloadUploadWorker.main_pipeline", new_callable=AsyncMock)
-def test_run_method_handles_cancellation(mock_main_pipeline, base_worker_params, worker_signals):
-    """Тест: метод run() ловит CancelledError и испускает 'finished' сигнал."""
-    # Настраиваем мок, чтобы он выбрасывал ошибку отмены
-    mock_main_pipeline.side_effect = CancelledError
-
-    worker = DownloadUploadWorker(**base_worker_params)
-    worker.signals = worker_signals
 
-    worker.run()
+@pytest.fixture
+def mock_main_pipeline(monkeypatch):
+    """Подменяет DownloadUploadWorker.main_pipeline асинхронным моком."""
+    pipeline_mock = AsyncMock()
+    monkeypatch.setattr("src.gui.DownloadUploadWorker.main_pipeline", pipeline_mock)
+    return pipeline_mock
 
-    # Проверяем, что был вызван сигнал finished с флагом отмены
-    worker.signals.finished.emit.assert_called_once_with([], [], True)
-    worker.signals.error.emit.assert_not_called()
 
+# ============================================
+# Тесты для логики runner'а (метода run)
+# ============================================
 
-@patch("src.gui.DownloadUploadWorker.main_pipeline", new_callable=AsyncMock)
-def test_run_method_handles_general_exception(mock_main_pipeline, base_worker_params, worker_signals):
-    """Тест: метод run() ловит общие исключения и испускает 'error' сигнал."""
-    # Настраиваем мок, чтобы он выбрасывал обычную ошибку
-    mock_main_pipeline.side_effect = ValueError("Test Error")
+@pytest.mark.parametrize("side_effect, expected_signal, expected_args", [
+    pytest.param(None, None, None, id="success"),
+    pytest.param(CancelledError, "finished", ([], [], True), id="cancelled"),
+    pytest.param(ValueError("Test Error"), "error", ("Test Error",), id="general_exception"),
+])
+def test_run_method_dispatches_pipeline_outcome(
+    side_effect, expected_signal, expected_args, mock_main_pipeline, base_worker_params, worker_signals
+):
+    """
+    Тест: метод run() вызывает main_pipeline и испускает сигнал по его результату.
+
+    CancelledError приводит к сигналу 'finished' с флагом отмены, прочие
+    исключения - к сигналу 'error'. При успехе run() сам сигналы не испускает.
+    """
+    mock_main_pipeline.side_effect = side_effect
 
     worker = DownloadUploadWorker(**base_worker_params)
     worker.signals = worker_signals
 
     worker.run()
 
-    # Проверяем, что был вызван сигнал error с текстом ошибки
-    worker.signals.error.emit.assert_called_once_with("Test Error")
-    worker.signals.finished.emit.assert_not_called()
+    mock_main_pipeline.assert_awaited_once()
+    for signal_name in ("finished", "error"):
+        signal = getattr(worker.signals, signal_name)
+        if signal_name == expected_signal:
+            signal.emit.assert_called_once_with(*expected_args)
+        else:
+            signal.emit.assert_not_called()
 
 
 # ============================================
 # Тесты для логики самого pipeline (main_pipeline)
 # ============================================
 
-@pytest.mark.asyncio
-@patch("src.gui.upload_single_file", new_callable=AsyncMock)
+def _async_return(value):
+    """Корутинная заглушка, которая возвращает value и запоминает аргументы вызовов."""
+    async def _stub(*args, **kwargs):
+        _stub.calls.append((args, kwargs))
+        return value
+    _stub.calls = []
+    return _stub
+
+
 @patch("src.gui.download_video")
-@patch("tempfile.TemporaryDirectory")
-async def test_pipeline_success(mock_temp_dir, mock_download, mock_upload, base_worker_params, worker_signals, tmp_path):
+async def test_pipeline_success(mock_download, base_worker_params, worker_signals, patched_tempdir, monkeypatch):
     """Тест успешного выполнения всего конвейера: скачивание + загрузка."""
-    mock_temp_dir.return_value.__enter__.return_value = str(tmp_path)
-    mock_download.return_value = {"status": "успех", "url": "http://test.url/1", "path": tmp_path / "video.mp4"}
-    mock_upload.return_value = {"status": "успех", "url": "http://cloud.url/video.mp4"}
+    mock_download.return_value = {"status": "успех", "url": "http://test.url/1", "path": patched_tempdir / "video.mp4"}
+    upload_stub = _async_return({"status": "успех", "url": "http://cloud.url/video.mp4"})
+    monkeypatch.setattr("src.gui.upload_single_file", upload_stub)
 
     worker = DownloadUploadWorker(**base_worker_params)
     worker.signals = worker_signals
 
     await worker.main_pipeline()
 
-    mock_download.assert_called_once()
-    mock_upload.assert_called_once()
-
-    # Проверяем, что сигнал finished был вызван с корректными результатами
+    # Проверяем, что сигнал finished был вызван с корректными результатами;
+    # по одному результату на этап означает ровно одно скачивание и одну загрузку
     worker.signals.finished.emit.assert_called_once()
     args, _ = worker.signals.finished.emit.call_args
     download_results, upload_results, is_cancelled = args
@@ -119,14 +135,12 @@ async def test_pipeline_success(mock_temp_dir, mock_download, mock_upload, base_
     assert not is_cancelled
 
 
-@pytest.mark.asyncio
-@patch("src.gui.upload_single_file", new_callable=AsyncMock)
 @patch("src.gui.download_video")
-@patch("tempfile.TemporaryDirectory")
-async def test_pipeline_download_failure(mock_temp_dir, mock_download, mock_upload, base_worker_params, worker_signals, tmp_path):
+async def test_pipeline_download_failure(mock_download, base_worker_params, worker_signals, patched_tempdir, monkeypatch):
     """Тест: конвейер останавливается, если скачивание не удалось."""
-    mock_temp_dir.return_value.__enter__.return_value = str(tmp_path)
     mock_download.return_value = {"status": "ошибка", "url": "http://test.url/1", "error": "Download failed"}
+    upload_stub = _async_return({"status": "успех"})
+    monkeypatch.setattr("src.gui.upload_single_file", upload_stub)
 
     worker = DownloadUploadWorker(**base_worker_params)
     worker.signals = worker_signals
@@ -134,19 +148,16 @@ async def test_pipeline_download_failure(mock_temp_dir, mock_download, mock_uplo
     await worker.main_pipeline()
 
     mock_download.assert_called_once()
-    mock_upload.assert_not_called()
+    assert upload_stub.calls == []
     worker.signals.error.emit.assert_called_with("Ошибка скачивания http://test.url/1: Download failed")
 
 
-@pytest.mark.asyncio
-@patch("src.gui.upload_single_file", new_callable=AsyncMock)
 @patch("src.gui.download_video")
-@patch("tempfile.TemporaryDirectory")
-async def test_pipeline_upload_failure(mock_temp_dir, mock_download, mock_upload, base_worker_params, worker_signals, tmp_path):
+async def test_pipeline_upload_failure(mock_download, base_worker_params, worker_signals, patched_tempdir, monkeypatch):
     """Тест: ошибка на этапе загрузки корректно обрабатывается."""
-    mock_temp_dir.return_value.__enter__.return_value = str(tmp_path)
-    mock_download.return_value = {"status": "успех", "url": "http://test.url/1", "path": tmp_path / "video.mp4"}
-    mock_upload.return_value = {"status": "ошибка", "error": "Upload failed"}
+    mock_download.return_value = {"status": "успех", "url": "http://test.url/1", "path": patched_tempdir / "video.mp4"}
+    upload_stub = _async_return({"status": "ошибка", "error": "Upload failed"})
+    monkeypatch.setattr("src.gui.upload_single_file", upload_stub)
 
     worker = DownloadUploadWorker(**base_worker_params)
     worker.signals = worker_signals
@@ -154,11 +165,37 @@ async def test_pipeline_upload_failure(mock_temp_dir, mock_download, mock_upload
     await worker.main_pipeline()
 
     mock_download.assert_called_once()
-    mock_upload.assert_called_once()
+    assert len(upload_stub.calls) == 1
     worker.signals.error.emit.assert_called_with("Ошибка загрузки: Upload failed")
 
 
-@pytest.mark.asyncio
+async def test_pipeline_uploads_while_downloading(base_worker_params, worker_signals, patched_tempdir, monkeypatch):
+    """Тест: загрузка первого файла начинается, пока второй файл еще скачивается."""
+    first_uploaded = threading.Event()
+    overlapped = []
+
+    def fake_download(url, *args):
+        if url.endswith("/2"):
+            # При последовательном конвейере загрузка не начнется и ожидание истечет
+            overlapped.append(first_uploaded.wait(timeout=2))
+        return {"status": "успех", "url": url, "path": patched_tempdir / f"video_{url[-1]}.mp4"}
+
+    async def fake_upload(task):
+        first_uploaded.set()
+        return {"status": "успех"}
+
+    monkeypatch.setattr("src.gui.download_video", fake_download)
+    monkeypatch.setattr("src.gui.upload_single_file", fake_upload)
+    worker = DownloadUploadWorker(**{**base_worker_params, "urls": ["http://test.url/1", "http://test.url/2"]})
+    worker.signals = worker_signals
+
+    await worker.main_pipeline()
+
+    assert overlapped == [True]
+    download_results, upload_results, _ = worker.signals.finished.emit.call_args.args
+    assert len(download_results) == len(upload_results) == 2
+
+
 async def test_pipeline_cancellation_propagates(base_worker_params):
     """Тест: установка флага отмены приводит к выбросу CancelledError."""
     worker = DownloadUploadWorker(**base_worker_params)
@@ -1,11 +1,12 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from PySide6.QtWidgets import QApplication, QPushButton
-from PySide6.QtCore import Qt
 from src.config import AppSettings
 from src.settings_dialog import SettingsDialog
 from pathlib import Path
 
+pytestmark = pytest.mark.slow
+
 
 @pytest.fixture(scope="session")
 def qapp():
@@ -16,10 +17,10 @@ def qapp():
     return app
 
 
-@pytest.fixture
-def mock_config(monkeypatch):
-    """Фикстура для создания и внедрения мока AppSettings."""
-    config_instance = AppSettings(
+@pytest.fixture(scope="module")
+def mock_config():
+    """Фикстура с тестовым экземпляром AppSettings, общим для модуля."""
+    return AppSettings(
         YANDEX_DISK_TOKEN="test-yandex-token",
         GOOGLE_CREDS_PATH="/path/to/creds.json",
         GOOGLE_TOKEN_PATH="/path/to/token.json",
@@ -28,17 +29,33 @@ def mock_config(monkeypatch):
         LOG_TO_FILE=True,
         LOG_FILE_PATH="/logs/app.log",
     )
-    monkeypatch.setattr("src.settings_dialog.get_config", lambda: config_instance)
-    return config_instance
 
 
-def test_settings_dialog_loads_settings_correctly(qapp, qtbot, mock_config):
+@pytest.fixture(scope="module")
+def _dialog_template(qapp, mock_config):
     """
-    Тест: проверяет, что диалог корректно загружает настройки из конфига в виджеты.
+    Экземпляр SettingsDialog, создаваемый один раз на модуль.
+
+    Построение виджетов и раскладки в PySide6 дорогое, поэтому между тестами
+    диалог не пересоздается, а только перезагружает настройки.
     """
-    dialog = SettingsDialog()
-    qtbot.addWidget(dialog)
+    with patch("src.settings_dialog.get_config", return_value=mock_config):
+        dialog = SettingsDialog()
+    yield dialog
+    dialog.deleteLater()
+
+
+@pytest.fixture
+def dialog(_dialog_template):
+    """Общий диалог, виджеты которого сброшены к значениям из конфига."""
+    _dialog_template.load_settings()
+    return _dialog_template
 
+
+def test_settings_dialog_loads_settings_correctly(dialog, mock_config):
+    """
+    Тест: проверяет, что диалог корректно загружает настройки из конфига в виджеты.
+    """
     yandex_token = mock_config.YANDEX_DISK_TOKEN.get_secret_value()
     assert dialog.yandex_token_edit.text() == yandex_token
     assert dialog.google_creds_path_edit.text() == "/path/to/creds.json"
@@ -49,13 +66,10 @@ def test_settings_dialog_loads_settings_correctly(qapp, qtbot, mock_config):
     assert Path(dialog.log_file_path_edit.text()) == Path("/logs/app.log")
 
 
-def test_settings_dialog_gathers_settings_data_correctly(qapp, qtbot, mock_config):
+def test_settings_dialog_gathers_settings_data_correctly(dialog, mock_config):
     """
     Тест: проверяет, что диалог правильно собирает измененные данные из виджетов.
     """
-    dialog = SettingsDialog()
-    qtbot.addWidget(dialog)
-
     dialog.yandex_token_edit.setText("new-yandex-token")
     dialog.google_creds_path_edit.setText("/new/creds.json")
     dialog.google_token_path_edit.setText("/new/token.json")
@@ -76,32 +90,26 @@ def test_settings_dialog_gathers_settings_data_correctly(qapp, qtbot, mock_confi
 
 
 @patch("src.settings_dialog.QFileDialog.getOpenFileName")
-def test_browse_google_creds_file(mock_get_open_file_name, qapp, qtbot, mock_config):
+def test_browse_google_creds_file(mock_get_open_file_name, dialog):
     """Тест: нажатие кнопки '...' для выбора файла учетных данных Google."""
-    dialog = SettingsDialog()
-    qtbot.addWidget(dialog)
-
     expected_path = "/mock/path/to/credentials.json"
     mock_get_open_file_name.return_value = (expected_path, "")
 
     browse_button = dialog.findChild(QPushButton, "browse_creds_btn")
-    qtbot.mouseClick(browse_button, Qt.MouseButton.LeftButton)
+    browse_button.click()
 
     mock_get_open_file_name.assert_called_once()
     assert dialog.google_creds_path_edit.text() == expected_path
 
 
 @patch("src.settings_dialog.QFileDialog.getSaveFileName")
-def test_browse_log_file(mock_get_save_file_name, qapp, qtbot, mock_config):
+def test_browse_log_file(mock_get_save_file_name, dialog):
     """Тест: нажатие кнопки '...' для выбора файла логов."""
-    dialog = SettingsDialog()
-    qtbot.addWidget(dialog)
-
     expected_path = "/mock/path/to/app.log"
     mock_get_save_file_name.return_value = (expected_path, "")
 
     browse_button = dialog.findChild(QPushButton, "browse_log_btn")
-    qtbot.mouseClick(browse_button, Qt.MouseButton.LeftButton)
+    browse_button.click()
 
     mock_get_save_file_name.assert_called_once()
     assert dialog.log_file_path_edit.text() == expected_path
\ No newline at end of file
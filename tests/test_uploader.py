@@ -1,11 +1,15 @@
 # tests/test_uploader.py
 
 import pytest
-from unittest.mock import patch, MagicMock, AsyncMock
+from contextlib import nullcontext
+from unittest.mock import patch, ANY, call, create_autospec, Mock, MagicMock, AsyncMock
 from pathlib import Path
 import shutil
 import os
+from types import MappingProxyType, SimpleNamespace
 
+from google.auth.credentials import AnonymousCredentials
+from googleapiclient.discovery import build as build_drive_service
 from googleapiclient.errors import HttpError
 # --- ИЗМЕНЕНИЕ 1: Новый импорт исключения ---
 from yadisk.exceptions import YaDiskError
@@ -19,19 +23,148 @@ from src.uploader import (
     LocalSaveStrategy,
 )
 
-@pytest.fixture
-def tmp_file(tmp_path):
-    p = tmp_path / "test_video.mp4"
+# Неизменяемый шаблон задачи на загрузку для тестов диспетчера
+_UPLOAD_TASK_DEFAULTS = MappingProxyType({
+    "cloud_storage": "Google Drive",
+    "cloud_folder_path": "folder",
+    "filename": "video.mp4",
+})
+
+class _FakeHttpError(HttpError):
+    """HttpError без разбора тела ответа: для стратегии важны только тип и статус."""
+    def __init__(self, status: int, reason: str):
+        self.resp = SimpleNamespace(status=status, reason=reason)
+        self.content = b""
+        self.uri = None
+        self.error_details = ""
+        self.reason = reason
+
+# Ожидаемые шаги создания цепочки папок "FolderA/FolderB/FolderC": (имя папки, ID родителя)
+_CHAIN_STEPS = (("FolderA", "root"), ("FolderB", "id_A"), ("FolderC", "id_B"))
+
+@pytest.fixture(scope="module")
+def tmp_file(tmp_path_factory):
+    """Файл-заглушка видео, общий для модуля: загрузки замоканы и его не изменяют."""
+    p = tmp_path_factory.mktemp("up") / "test_video.mp4"
     p.write_text("dummy content")
     return p
 
+@pytest.fixture(scope="module")
+def _auth_getter_mocks():
+    """Моки функций получения учетных данных, подставленные один раз на модуль."""
+    yandex_mock = MagicMock()
+    google_mock = MagicMock()
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("src.uploader.get_yandex_token", yandex_mock)
+        mp.setattr("src.uploader.get_google_drive_credentials", google_mock)
+        yield yandex_mock, google_mock
+
+@pytest.fixture
+def mock_auth_getters(_auth_getter_mocks):
+    """Моки получения учетных данных, сброшенные к успешным ответам."""
+    yandex_mock, google_mock = _auth_getter_mocks
+    yandex_mock.reset_mock(side_effect=True)
+    yandex_mock.return_value = "fake-yandex-token"
+    google_mock.reset_mock(side_effect=True)
+    google_mock.return_value = MagicMock()
+    return _auth_getter_mocks
+
+@pytest.fixture
+def upload_task(tmp_file):
+    """Новая задача на загрузку, собранная из неизменяемого шаблона."""
+    return {**_UPLOAD_TASK_DEFAULTS, "file_path": str(tmp_file)}
+
+class _FakeYaDisk:
+    """
+    Легковесная замена клиента yadisk.AsyncYaDisk.
+
+    Методы - обычные корутины с настраиваемыми ответами, поэтому на каждый
+    await не создается обертка AsyncMock. Вызов экземпляра подменяет
+    конструктор клиента.
+    """
+    def __init__(self):
+        self.token_valid = True
+        self.folder_exists = False
+        self.upload_error = None
+        self.download_link = "http://fake.link"
+        self.created_folders = []
+        self.uploaded = []
+
+    def __call__(self, **kwargs):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def check_token(self):
+        return self.token_valid
+
+    async def exists(self, path):
+        return self.folder_exists
+
+    async def mkdir(self, path):
+        self.created_folders.append(path)
+
+    async def upload(self, src, dst, overwrite=False):
+        if self.upload_error:
+            raise self.upload_error
+        self.uploaded.append(dst)
+
+    async def get_download_link(self, path):
+        return self.download_link
+
+@pytest.fixture
+def yadisk_fake(monkeypatch):
+    """Подменяет клиент Яндекс.Диска новым экземпляром _FakeYaDisk."""
+    fake_disk = _FakeYaDisk()
+    monkeypatch.setattr("src.uploader.yadisk.AsyncYaDisk", fake_disk)
+    return fake_disk
+
+@pytest.fixture(scope="session")
+def _gdrive_service_template():
+    """
+    Эталонные autospec-моки сервиса Google Drive и его ресурса files().
+
+    Спецификация строится один раз за сессию по статическому discovery-документу
+    googleapiclient без обращения к сети, поэтому опечатка в имени метода API
+    приводит к AttributeError, а не к молча созданному дочернему моку.
+    """
+    service = build_drive_service("drive", "v3", credentials=AnonymousCredentials(), static_discovery=True)
+    return SimpleNamespace(
+        service=create_autospec(service, instance=True),
+        files=create_autospec(service.files(), instance=True),
+    )
+
+@pytest.fixture
+def gdrive_service(_gdrive_service_template, monkeypatch):
+    """Сброшенный мок сервиса Google Drive, возвращаемый build()."""
+    service_mock = _gdrive_service_template.service
+    service_mock.reset_mock(return_value=True, side_effect=True)
+    _gdrive_service_template.files.reset_mock(return_value=True, side_effect=True)
+    service_mock.files.return_value = _gdrive_service_template.files
+    monkeypatch.setattr("src.uploader.build", lambda *args, **kwargs: service_mock)
+    return service_mock
+
 @pytest.fixture
-def mock_auth_getters(monkeypatch):
-    yandex_mock = MagicMock(return_value="fake-yandex-token")
-    google_mock = MagicMock(return_value=MagicMock())
-    monkeypatch.setattr("src.uploader.get_yandex_token", yandex_mock)
-    monkeypatch.setattr("src.uploader.get_google_drive_credentials", google_mock)
-    return yandex_mock, google_mock
+def drive_files(gdrive_service):
+    """
+    Ресурс files() сервиса Google Drive с типовыми ответами.
+
+    По умолчанию папок нет, создание папки и загрузка файла успешны; тест
+    переопределяет только нужный ему лист цепочки.
+    """
+    files = gdrive_service.files.return_value
+    files.list.return_value.execute.return_value = {"files": []}
+    files.create.return_value.execute.return_value = {"id": "fake_folder_id"}
+    return files
+
+def _drive_about_stub(execute):
+    """Заглушка сервиса Google Drive, поддерживающая только about().get().execute()."""
+    request = SimpleNamespace(execute=execute)
+    return SimpleNamespace(about=lambda: SimpleNamespace(get=lambda **kwargs: request))
 
 def test_upload_error_with_details():
     details = {"code": 500}
@@ -41,72 +174,46 @@ def test_upload_error_with_details():
 # ==================================
 # Тесты для YandexDiskUploaderStrategy
 # ==================================
-@pytest.mark.asyncio
 # --- ИЗМЕНЕНИЕ 2: Обновлен путь для patch ---
-@patch("src.uploader.yadisk.AsyncYaDisk")
-async def test_yandex_upload_success(mock_yadisk, tmp_file, mock_auth_getters):
-    mock_disk = AsyncMock()
-    mock_disk.check_token.return_value = True
-    mock_disk.exists.return_value = False
-    mock_disk.get_download_link.return_value = "http://fake.link"
-    mock_yadisk.return_value.__aenter__.return_value = mock_disk
+async def test_yandex_upload_success(yadisk_fake, tmp_file, mock_auth_getters):
     strategy = YandexDiskUploaderStrategy()
     result = await strategy.upload(tmp_file, "test_folder", "video.mp4")
-    assert result["status"] == "успех"
+    assert result == {"status": "успех", "url": "http://fake.link"}
+    assert yadisk_fake.created_folders == ["/test_folder"]
+    assert yadisk_fake.uploaded == ["/test_folder/video.mp4"]
 
-@pytest.mark.asyncio
 async def test_yandex_upload_no_token(mock_auth_getters):
     mock_auth_getters[0].return_value = None
     strategy = YandexDiskUploaderStrategy()
     with pytest.raises(UploadError, match="Токен Яндекс.Диска не найден"):
         await strategy.upload(MagicMock(), "folder", "file")
 
-@pytest.mark.asyncio
-@patch("src.uploader.yadisk.AsyncYaDisk")
-async def test_yandex_upload_invalid_token(mock_yadisk, tmp_file, mock_auth_getters):
-    mock_disk = AsyncMock()
-    mock_disk.check_token.return_value = False
-    mock_yadisk.return_value.__aenter__.return_value = mock_disk
+async def test_yandex_upload_invalid_token(yadisk_fake, tmp_file, mock_auth_getters):
+    yadisk_fake.token_valid = False
     strategy = YandexDiskUploaderStrategy()
     with pytest.raises(UploadError, match="Токен Яндекс.Диска невалиден"):
         await strategy.upload(tmp_file, "folder", "video.mp4")
 
-@pytest.mark.asyncio
-@patch("src.uploader.yadisk.AsyncYaDisk")
-async def test_yandex_upload_api_error(mock_yadisk, tmp_file, mock_auth_getters):
-    mock_disk = AsyncMock()
-    mock_disk.check_token.return_value = True
-    mock_disk.upload.side_effect = YaDiskError("API limit exceeded")
-    mock_yadisk.return_value.__aenter__.return_value = mock_disk
+async def test_yandex_upload_api_error(yadisk_fake, tmp_file, mock_auth_getters):
+    yadisk_fake.upload_error = YaDiskError("API limit exceeded")
     strategy = YandexDiskUploaderStrategy()
     with pytest.raises(UploadError, match="Ошибка API Яндекс.Диска"):
         await strategy.upload(tmp_file, "folder", "video.mp4")
 
-@pytest.mark.asyncio
-@patch("src.uploader.yadisk.AsyncYaDisk")
-async def test_yandex_check_connection_success(mock_yadisk, mock_auth_getters):
-    mock_disk = AsyncMock()
-    mock_disk.check_token.return_value = True
-    mock_yadisk.return_value.__aenter__.return_value = mock_disk
+async def test_yandex_check_connection_success(yadisk_fake, mock_auth_getters):
     strategy = YandexDiskUploaderStrategy()
     assert (await strategy.check_connection())[0] is True
 
-@pytest.mark.asyncio
 async def test_yandex_check_connection_no_token(mock_auth_getters):
     mock_auth_getters[0].return_value = None
     strategy = YandexDiskUploaderStrategy()
     assert (await strategy.check_connection())[0] is False
 
-@pytest.mark.asyncio
-@patch("src.uploader.yadisk.AsyncYaDisk")
-async def test_yandex_check_connection_invalid_token(mock_yadisk, mock_auth_getters):
-    mock_disk = AsyncMock()
-    mock_disk.check_token.return_value = False
-    mock_yadisk.return_value.__aenter__.return_value = mock_disk
+async def test_yandex_check_connection_invalid_token(yadisk_fake, mock_auth_getters):
+    yadisk_fake.token_valid = False
     strategy = YandexDiskUploaderStrategy()
     assert (await strategy.check_connection())[0] is False
 
-@pytest.mark.asyncio
 @patch("src.uploader.yadisk.AsyncYaDisk", side_effect=Exception("Network error"))
 async def test_yandex_check_connection_network_error(mock_yadisk, mock_auth_getters):
     strategy = YandexDiskUploaderStrategy()
@@ -115,99 +222,79 @@ async def test_yandex_check_connection_network_error(mock_yadisk, mock_auth_gett
 # ==================================
 # Тесты для GoogleDriveUploaderStrategy
 # ==================================
-@patch("src.uploader.build")
-def test_google_upload_sync_success_new_folder(mock_build, tmp_file, mock_auth_getters):
-    mock_service = MagicMock()
-    mock_build.return_value = mock_service
-    mock_files_resource = mock_service.files.return_value
-    mock_files_resource.list.return_value.execute.return_value = {"files": []}
-    mock_files_resource.create.return_value.execute.side_effect = [
-        {"id": "fake_folder_id"},
-        {"id": "fake_file_id", "webViewLink": "http://fake.link"}
-    ]
+def test_google_upload_sync_success_new_folder(gdrive_service, drive_files, tmp_file, mock_auth_getters):
     strategy = GoogleDriveUploaderStrategy()
     result = strategy._upload_sync(tmp_file, "new_folder", "video.mp4")
     assert result["status"] == "успех"
-    assert mock_files_resource.create.call_count == 2
-
-@patch("src.uploader.build")
-def test_google_upload_sync_folder_exists(mock_build, tmp_file, mock_auth_getters):
-    mock_service = MagicMock()
-    mock_build.return_value = mock_service
-    mock_files_resource = mock_service.files.return_value
-    mock_files_resource.list.return_value.execute.return_value = {"files": [{"id": "existing_folder_id"}]}
-    mock_files_resource.create.return_value.execute.return_value = {"id": "fake_file_id"}
+    gdrive_service.files.assert_called_once()
+    assert drive_files.create.call_count == 2
+    assert drive_files.create.call_args == call(
+        body={"name": "video.mp4", "parents": ["fake_folder_id"]}, media_body=ANY, fields="id, webViewLink"
+    )
+
+def test_google_upload_sync_folder_exists(drive_files, tmp_file, mock_auth_getters):
+    drive_files.list.return_value.execute.return_value = {"files": [{"id": "existing_folder_id"}]}
     strategy = GoogleDriveUploaderStrategy()
     strategy._upload_sync(tmp_file, "existing_folder", "video.mp4")
-    mock_files_resource.list.assert_called_once()
-    mock_files_resource.create.assert_called_once()
-
-@patch("src.uploader.build")
-def test_google_upload_sync_empty_path(mock_build, tmp_file, mock_auth_getters):
-    mock_service = MagicMock()
-    mock_build.return_value = mock_service
-    mock_files_resource = mock_service.files.return_value
-    mock_files_resource.create.return_value.execute.return_value = {"id": "fake_file_id"}
+    drive_files.list.assert_called_once()
+    drive_files.create.assert_called_once()
+
+def test_google_upload_sync_empty_path(drive_files, tmp_file, mock_auth_getters):
     strategy = GoogleDriveUploaderStrategy()
     strategy._upload_sync(tmp_file, "", "video.mp4")
-    mock_files_resource.list.assert_not_called()
-    assert mock_files_resource.create.call_args.kwargs['body']['parents'] == ['root']
-
-@patch("src.uploader.build")
-def test_google_upload_sync_create_folder_error(mock_build, tmp_file, mock_auth_getters):
-    mock_service = MagicMock()
-    mock_build.return_value = mock_service
-    mock_files_resource = mock_service.files.return_value
-    mock_files_resource.list.return_value.execute.return_value = {"files": []}
-    http_error = HttpError(resp=MagicMock(status=403), content=b"Forbidden")
-    mock_files_resource.create.return_value.execute.side_effect = http_error
+    drive_files.list.assert_not_called()
+    assert drive_files.create.call_args.kwargs['body']['parents'] == ['root']
+
+def test_google_upload_sync_create_folder_error(drive_files, tmp_file, mock_auth_getters):
+    drive_files.create.return_value.execute.side_effect = _FakeHttpError(403, "Forbidden")
     strategy = GoogleDriveUploaderStrategy()
     with pytest.raises(UploadError, match="Ошибка API Google Drive при создании папки"):
         strategy._upload_sync(tmp_file, "new_folder", "video.mp4")
 
-@patch("src.uploader.build")
-def test_google_upload_sync_upload_file_error(mock_build, tmp_file, mock_auth_getters):
-    mock_service = MagicMock()
-    mock_build.return_value = mock_service
-    mock_files_resource = mock_service.files.return_value
-    mock_files_resource.list.return_value.execute.return_value = {"files": [{"id": "id_A"}]}
-    http_error = HttpError(resp=MagicMock(status=403), content=b"Forbidden")
-    mock_files_resource.create.return_value.execute.side_effect = http_error
+def test_google_upload_sync_upload_file_error(drive_files, tmp_file, mock_auth_getters):
+    drive_files.list.return_value.execute.return_value = {"files": [{"id": "id_A"}]}
+    drive_files.create.return_value.execute.side_effect = _FakeHttpError(403, "Forbidden")
     strategy = GoogleDriveUploaderStrategy()
     with pytest.raises(UploadError, match="Ошибка API Google Drive:"):
         strategy._upload_sync(tmp_file, "existing_folder", "video.mp4")
 
+def test_google_upload_sync_retries_upload(drive_files, tmp_file, mock_auth_getters):
+    """Тест: загрузка файла выполняется с повторами при временных ошибках API."""
+    drive_files.list.return_value.execute.return_value = {"files": [{"id": "id_A"}]}
+    strategy = GoogleDriveUploaderStrategy()
+    strategy._upload_sync(tmp_file, "existing_folder", "video.mp4")
+    drive_files.create.return_value.execute.assert_called_once_with(num_retries=5)
+
 def test_google_upload_sync_no_creds(mock_auth_getters, tmp_file):
     mock_auth_getters[1].return_value = None
     strategy = GoogleDriveUploaderStrategy()
     with pytest.raises(UploadError, match="Не удалось получить учетные данные Google Drive"):
         strategy._upload_sync(tmp_file, "folder", "video.mp4")
 
-@pytest.mark.asyncio
-@patch("src.uploader.build")
-async def test_google_check_connection_success(mock_build, mock_auth_getters):
-    mock_service = MagicMock()
-    mock_build.return_value = mock_service
+async def test_google_check_connection_success(mock_auth_getters, monkeypatch):
+    service = _drive_about_stub(execute=lambda: {"user": {}})
+    monkeypatch.setattr("src.uploader.build", lambda *args, **kwargs: service)
     strategy = GoogleDriveUploaderStrategy()
     assert (await strategy.check_connection())[0] is True
 
-@pytest.mark.asyncio
-@patch("src.uploader.build")
-async def test_google_check_connection_failure(mock_build, mock_auth_getters):
-    mock_service = MagicMock()
-    mock_service.about().get().execute.side_effect = Exception("API Error")
-    mock_build.return_value = mock_service
+async def test_google_check_connection_failure(mock_auth_getters, monkeypatch):
+    service = _drive_about_stub(execute=Mock(side_effect=Exception("API Error")))
+    monkeypatch.setattr("src.uploader.build", lambda *args, **kwargs: service)
     strategy = GoogleDriveUploaderStrategy()
     assert (await strategy.check_connection())[0] is False
 
-@patch("src.uploader.build")
-def test_google_upload_sync_find_folder_error(mock_build, tmp_file, mock_auth_getters):
+@pytest.mark.parametrize("path", ["FolderA/FolderB/FolderC", "/FolderA//FolderB/FolderC/"])
+def test_google_create_folders_chain(path):
+    """Тест: каждая папка пути ищется или создается внутри предыдущей, пустые сегменты пропускаются."""
+    files = Mock()
+    strategy = GoogleDriveUploaderStrategy()
+    with patch.object(strategy, "_find_or_create_folder", side_effect=["id_A", "id_B", "id_C"]) as mock_find_or_create:
+        assert strategy._create_folders_chain(files, "root", path) == "id_C"
+    assert mock_find_or_create.call_args_list == [call(files, parent, name) for name, parent in _CHAIN_STEPS]
+
+def test_google_upload_sync_find_folder_error(drive_files, tmp_file, mock_auth_getters):
     """Тест: ошибка API при поиске папки в Google Drive."""
-    mock_service = MagicMock()
-    mock_build.return_value = mock_service
-    mock_files_resource = mock_service.files.return_value
-    http_error = HttpError(resp=MagicMock(status=404), content=b"Not Found")
-    mock_files_resource.list.return_value.execute.side_effect = http_error
+    drive_files.list.return_value.execute.side_effect = _FakeHttpError(404, "Not Found")
 
     strategy = GoogleDriveUploaderStrategy()
 
@@ -217,38 +304,47 @@ def test_google_upload_sync_find_folder_error(mock_build, tmp_file, mock_auth_ge
 # ==================================
 # Тесты для LocalSaveStrategy
 # ==================================
-@pytest.mark.asyncio
+@pytest.fixture(scope="module")
+def local_paths(tmp_path_factory):
+    """
+    Реальные пути разных видов для проверки LocalSaveStrategy.check_connection.
+
+    Проверки только читают файловую систему, поэтому пути создаются один раз на модуль.
+    """
+    base_dir = tmp_path_factory.mktemp("local")
+    plain_file = base_dir / "plain_file.txt"
+    plain_file.touch()
+    return MappingProxyType({
+        "dir": str(base_dir),
+        "missing": str(base_dir / "missing"),
+        "file": str(plain_file),
+        "empty": "",
+    })
+
 async def test_local_upload_success(tmp_file):
     strategy = LocalSaveStrategy()
     new_filename = f"copy_of_{tmp_file.name}"
     result = await strategy.upload(tmp_file, str(tmp_file.parent), new_filename)
     assert result["status"] == "успех"
 
-@pytest.mark.asyncio
 @patch("shutil.copy2", side_effect=shutil.Error("Disk full"))
 async def test_local_upload_failure(mock_copy, tmp_file):
     strategy = LocalSaveStrategy()
     with pytest.raises(UploadError, match="Ошибка при локальном копировании файла"):
         await strategy.upload(tmp_file, str(tmp_file.parent), "new_name.mp4")
 
-@pytest.mark.asyncio
-@pytest.mark.parametrize("path_exists, is_dir, can_write, expected_ok, expected_msg_part, path_kwarg", [
-    (True, True, True, True, "", {"path": "dummy"}),
-    (False, True, True, False, "Путь не существует", {"path": "dummy"}),
-    (True, False, True, False, "Путь не является папкой", {"path": "dummy"}),
-    (True, True, False, False, "Нет прав на запись", {"path": "dummy"}),
-    (True, True, True, False, "Путь для локального сохранения не указан", {"path": ""}),
+@pytest.mark.parametrize("path_kind, can_write, expected_ok, expected_msg_part", [
+    ("dir", True, True, ""),
+    ("missing", True, False, "Путь не существует"),
+    ("file", True, False, "Путь не является папкой"),
+    ("dir", False, False, "Нет прав на запись"),
+    ("empty", True, False, "Путь для локального сохранения не указан"),
 ])
-async def test_local_check_connection_scenarios(
-    path_exists, is_dir, can_write, expected_ok, expected_msg_part, path_kwarg, tmp_path, monkeypatch
-):
-    if "path" in path_kwarg and path_kwarg["path"] == "dummy":
-        path_kwarg["path"] = str(tmp_path)
-    monkeypatch.setattr("pathlib.Path.exists", lambda self: path_exists)
-    monkeypatch.setattr("pathlib.Path.is_dir", lambda self: is_dir)
-    monkeypatch.setattr("os.access", lambda path, mode: can_write)
+async def test_local_check_connection_scenarios(path_kind, can_write, expected_ok, expected_msg_part, local_paths):
     strategy = LocalSaveStrategy()
-    is_ok, msg = await strategy.check_connection(**path_kwarg)
+    # Переносимо отнять права на запись нельзя (root, Windows), поэтому os.access подменяется только на время вызова
+    with patch.object(os, "access", return_value=False) if not can_write else nullcontext():
+        is_ok, msg = await strategy.check_connection(path=local_paths[path_kind])
     assert is_ok is expected_ok
     if not expected_ok:
         assert expected_msg_part in msg
@@ -256,27 +352,36 @@ async def test_local_check_connection_scenarios(
 # ==================================
 # Тесты для диспетчера upload_single_file
 # ==================================
-@pytest.mark.asyncio
-@pytest.mark.parametrize("storage_name, strategy_class", UPLOADER_STRATEGIES.items())
-async def test_dispatcher_selects_correct_strategy(storage_name, strategy_class, tmp_file):
-    task = {"file_path": str(tmp_file), "cloud_storage": storage_name, "cloud_folder_path": "folder", "filename": "video.mp4"}
-    with patch.object(strategy_class, "upload", new_callable=AsyncMock) as mock_upload:
-        mock_upload.return_value = {"status": "успех"}
-        await upload_single_file(task)
-        mock_upload.assert_called_once()
-
-@pytest.mark.asyncio
-async def test_dispatcher_strategy_not_found(tmp_file):
-    task = {"cloud_storage": "Invalid Storage", "filename": "video.mp4", "file_path": "dummy", "cloud_folder_path": ""}
+async def test_dispatcher_selects_correct_strategy(upload_task):
+    # Все стратегии проверяются в одном тесте, чтобы не поднимать цикл событий на каждую
+    for storage_name, strategy_class in UPLOADER_STRATEGIES.items():
+        task = upload_task | {"cloud_storage": storage_name}
+        with patch.object(strategy_class, "upload", new_callable=AsyncMock) as mock_upload:
+            mock_upload.return_value = {"status": "успех"}
+            await upload_single_file(task)
+            assert mock_upload.call_count == 1, storage_name
+
+async def test_dispatcher_strategy_not_found(upload_task):
+    task = upload_task | {"cloud_storage": "Invalid Storage"}
     result = await upload_single_file(task)
     assert result["status"] == "ошибка"
     assert "Не найдена стратегия" in result["error"]
 
-@pytest.mark.asyncio
-async def test_dispatcher_handles_general_exception(tmp_file, mock_auth_getters):
-    task = {"file_path": str(tmp_file), "cloud_storage": "Google Drive", "cloud_folder_path": "folder", "filename": "video.mp4"}
+async def test_dispatcher_handles_general_exception(upload_task, mock_auth_getters):
     with patch.object(GoogleDriveUploaderStrategy, "upload", new_callable=AsyncMock) as mock_upload:
         mock_upload.side_effect = ValueError("Some unexpected error")
-        result = await upload_single_file(task)
+        result = await upload_single_file(upload_task)
         assert result["status"] == "ошибка"
-        assert "Some unexpected error" in result["error"]
\ No newline at end of file
+        assert "Some unexpected error" in result["error"]
+
+@pytest.mark.parametrize("storage_name, getter_index, expected_error", [
+    ("Yandex.Disk", 0, "Токен Яндекс.Диска не найден"),
+    ("Google Drive", 1, "Не удалось получить учетные данные Google Drive"),
+])
+async def test_dispatcher_reports_missing_credentials(
+    storage_name, getter_index, expected_error, upload_task, mock_auth_getters
+):
+    mock_auth_getters[getter_index].return_value = None
+    result = await upload_single_file(upload_task | {"cloud_storage": storage_name})
+    assert result["status"] == "ошибка"
+    assert expected_error in result["error"]